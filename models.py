@@ -1,18 +1,19 @@
 from datetime import datetime
+from typing import Annotated
 
-from pydantic import AnyUrl, BaseModel
+from pydantic import BaseModel, WithJsonSchema
+
+# URL の検証は util での取り込み時に一度だけ行うため、型は str のままにしつつ
+# ツールの出力スキーマには AnyUrl と同じ URI 形式を公開する
+UrlStr = Annotated[str, WithJsonSchema({"type": "string", "format": "uri", "minLength": 1})]
 
 
 class WeeklyAWSJpUpdate(BaseModel):
     title: str
-    url: AnyUrl
+    url: UrlStr
     published: datetime
     summary: str | None = None
 
 
-class WeeklyAWSJpDetailedUpdate(BaseModel):
-    title: str
-    url: AnyUrl
-    published: datetime
-    summary: str | None = None
+class WeeklyAWSJpDetailedUpdate(WeeklyAWSJpUpdate):
     content: str | None = None
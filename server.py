@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import os
 import sys
 
@@ -10,6 +11,7 @@ from util import (
     get_latest_generative_ai_details,
     get_latest_weekly_aws_details,
     get_recent_entries,
+    warm_up_feedparser,
 )
 
 # ログ
@@ -47,6 +49,8 @@ async def get_weekly_jp_updates(
     ## Usage
     このツールは、AWS Japan Blog の RSS フィードから、指定された日数 (`days`) 以内に公開された
     「週刊AWS」タグの記事を取得し、最大 `limit` 件までのリストを返します。
+    フィードは新しい順に先頭 30 件までしか読み込まないため、`limit` に 30 より大きい値を指定しても
+    返される記事は最大 30 件です。
 
     ## When to Use
     - 特定期間内の週刊AWSの更新情報をまとめて確認したい場合。
@@ -62,14 +66,15 @@ async def get_weekly_jp_updates(
     Args:
         ctx: MCP コンテキスト
         days: 何日前までの記事を取得するか (デフォルト: 7)
-        limit: 最大取得件数 (デフォルト: 10)
+        limit: 最大取得件数 (デフォルト: 10、上限: 30)
 
     Returns:
         WeeklyAWSJpUpdate モデルのリスト
 
     """
     await ctx.info(f"過去 {days} 日分の週刊AWS記事を取得します (最大 {limit} 件)")
-    entries = get_recent_entries(days=days, limit=limit)
+    # フィード取得はブロッキング処理のため、イベントループを塞がないよう別スレッドで実行する
+    entries = await asyncio.to_thread(get_recent_entries, days=days, limit=limit)
     await ctx.info(f"{len(entries)} 件の記事が見つかりました。")
     return entries
 
@@ -103,7 +108,7 @@ async def get_latest_jp_update_details(ctx: Context) -> WeeklyAWSJpDetailedUpdat
 
     """
     await ctx.info("最新の「週刊AWS」記事の詳細を取得します")
-    entry = get_latest_weekly_aws_details()  # 呼び出す関数を変更
+    entry = await asyncio.to_thread(get_latest_weekly_aws_details)
     if not entry:
         await ctx.warning("最新の「週刊AWS」記事が見つかりませんでした")
         return None
@@ -142,7 +147,7 @@ async def get_latest_generative_ai_jp_update_details(
 
     """
     await ctx.info("最新の「週刊生成AI with AWS」記事の詳細を取得します")
-    entry = get_latest_generative_ai_details()  # 呼び出す関数を変更
+    entry = await asyncio.to_thread(get_latest_generative_ai_details)
     if not entry:
         await ctx.warning("最新の「週刊生成AI with AWS」記事が見つかりませんでした")
         return None
@@ -157,6 +162,7 @@ def main() -> None:
     args = parser.parse_args()
 
     logger.info("Starting Weekly AWS JP MCP Server")
+    warm_up_feedparser()
     if args.sse:
         mcp.settings.port = args.port
         mcp.run(transport="sse")
@@ -1,7 +1,5 @@
 from datetime import UTC, datetime
 
-from pydantic import AnyUrl
-
 from models import WeeklyAWSJpDetailedUpdate, WeeklyAWSJpUpdate
 
 
@@ -13,12 +11,12 @@ class TestWeeklyAWSJpUpdate:
         now = datetime.now(UTC)
         update = WeeklyAWSJpUpdate(
             title="週刊AWSニュース 2024/07/22",
-            url=AnyUrl("https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/"),
+            url="https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/",
             published=now,
             summary="test",
         )
         assert update.title == "週刊AWSニュース 2024/07/22"
-        assert str(update.url) == "https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/"
+        assert update.url == "https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/"
         assert update.published == now
         assert update.summary == "test"
 
@@ -27,14 +25,25 @@ class TestWeeklyAWSJpUpdate:
         now = datetime.now(UTC)
         update = WeeklyAWSJpUpdate(
             title="週刊AWSニュース 2024/07/22",
-            url=AnyUrl("https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/"),
+            url="https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/",
             published=now,
         )
         assert update.title == "週刊AWSニュース 2024/07/22"
-        assert str(update.url) == "https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/"
+        assert update.url == "https://aws.amazon.com/jp/blogs/news/weekly-aws-news-20240722/"
         assert update.published == now
         assert update.summary is None
 
+    def test_url_json_schema(self) -> None:
+        """Test that the url field keeps the URI format in the JSON schema."""
+        for model in (WeeklyAWSJpUpdate, WeeklyAWSJpDetailedUpdate):
+            for mode in ("validation", "serialization"):
+                assert model.model_json_schema(mode=mode)["properties"]["url"] == {
+                    "format": "uri",
+                    "minLength": 1,
+                    "title": "Url",
+                    "type": "string",
+                }
+
 
 class TestWeeklyAWSJpDetailedUpdate:
     """Tests for WeeklyAWSJpDetailedUpdate model."""
@@ -44,13 +53,13 @@ class TestWeeklyAWSJpDetailedUpdate:
         now = datetime.now(UTC)
         update = WeeklyAWSJpDetailedUpdate(
             title="詳細な週刊AWSニュース 2024/07/22",
-            url=AnyUrl("https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/"),
+            url="https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/",
             published=now,
             summary="test",
             content="test",
         )
         assert update.title == "詳細な週刊AWSニュース 2024/07/22"
-        assert str(update.url) == "https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/"
+        assert update.url == "https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/"
         assert update.published == now
         assert update.summary == "test"
         assert update.content == "test"
@@ -60,11 +69,11 @@ class TestWeeklyAWSJpDetailedUpdate:
         now = datetime.now(UTC)
         update = WeeklyAWSJpDetailedUpdate(
             title="詳細な週刊AWSニュース 2024/07/22",
-            url=AnyUrl("https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/"),
+            url="https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/",
             published=now,
         )
         assert update.title == "詳細な週刊AWSニュース 2024/07/22"
-        assert str(update.url) == "https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/"
+        assert update.url == "https://aws.amazon.com/jp/blogs/news/detailed-weekly-aws-news-20240722/"
         assert update.published == now
         assert update.summary is None
         assert update.content is None
@@ -1,9 +1,9 @@
+from collections import deque
 from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
 from mcp.server.fastmcp import Context as MCPContext
-from pydantic import ConfigDict
 
 from models import WeeklyAWSJpDetailedUpdate, WeeklyAWSJpUpdate
 from server import (
@@ -16,17 +16,18 @@ from server import (
 class MockContext(MCPContext):
     """サーバー関数のテスト用モックコンテキスト。
 
-    MCPContext を継承し、ログメッセージを内部リストに記録します。
-    Pydantic モデルとして、追加の属性 (`info_messages` など) を許可します。
+    MCPContext を継承し、ログメッセージを内部の deque に記録します。
+    記録用の属性は Pydantic のフィールドではなく `__slots__` に保持し、
+    Pydantic の `__setattr__` を経由せずに初期化します。
     """
 
-    model_config = ConfigDict(extra="allow")
+    __slots__ = ("error_messages", "info_messages", "warning_messages")
 
     def __init__(self) -> None:
         super().__init__()
-        self.info_messages: list[str] = []
-        self.warning_messages: list[str] = []
-        self.error_messages: list[str] = []
+        object.__setattr__(self, "info_messages", deque())
+        object.__setattr__(self, "warning_messages", deque())
+        object.__setattr__(self, "error_messages", deque())
 
     async def info(self, message: str) -> None:
         """INFO レベルのログメッセージを記録します。
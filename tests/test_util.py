@@ -1,21 +1,49 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock
 
+import feedparser
 import pytest
+import requests
 from feedparser import FeedParserDict
+from pydantic import ValidationError
 from pytest_mock import MockerFixture
 
 from models import WeeklyAWSJpDetailedUpdate, WeeklyAWSJpUpdate
 from util import (
+    _SESSION,
+    FEED_CACHE_TTL,
+    MAX_ENTRIES,
+    REQUEST_TIMEOUT,
+    RSS_FEED_URL,
     _extract_content_string,
+    _feed_cache,
+    _latest_details_cache,
+    _read_feed_body,
+    _scan_latest,
+    _truncate_feed,
+    _validate_url,
     get_feed_entries,
     get_latest_generative_ai_details,
     get_latest_weekly_aws_details,
     get_recent_entries,
+    warm_up_feedparser,
 )
 
 # --- Test Data Fixtures ---
 
 
+@pytest.fixture(autouse=True)
+def clear_feed_cache() -> None:
+    """テスト間でフィード関連のキャッシュが共有されないよう、各テストの前にクリアするフィクスチャ。"""
+    _feed_cache.clear()
+    _latest_details_cache.clear()
+
+
 @pytest.fixture
 def mock_feed_entry_base() -> dict:
     """基本的なフィードエントリの辞書を返すフィクスチャ。"""
@@ -108,41 +136,433 @@ def mock_feed_data_empty() -> FeedParserDict:
 # --- Tests for get_feed_entries ---
 
 
-def test_get_feed_entries_success(mocker: MockerFixture, mock_feed_data: FeedParserDict) -> None:
+def test_session_retries_transient_errors() -> None:
+    """接続が切断された場合、フィード取得用のアダプターが再試行して応答を受け取ることをテストします。
+
+    requests-mock はアダプターごと差し替えるため、実際のアダプターをローカルの HTTP サーバーに向けて検証します。
+    """
+    request_count = 0
+
+    class FlakyHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            nonlocal request_count
+            request_count += 1
+            if request_count == 1:
+                # 初回は応答を返さずに接続を切断する
+                self.close_connection = True
+                return
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *_: object) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with requests.Session() as session:
+            session.mount("http://", _SESSION.get_adapter(RSS_FEED_URL))
+            response = session.get(f"http://127.0.0.1:{server.server_port}/", timeout=REQUEST_TIMEOUT)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == b"ok"
+    assert request_count == 2  # noqa: PLR2004
+
+
+@pytest.fixture
+def mock_response() -> MagicMock:
+    """RSSフィードの HTTP レスポンス (200 OK) を模したモックを返すフィクスチャ。"""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = HTTPStatus.OK
+    response.url = RSS_FEED_URL
+    response.iter_content.return_value = [b"<rss><channel>", b"</channel></rss>"]
+    response.headers = {
+        "Content-Type": "application/rss+xml; charset=UTF-8",
+        "ETag": '"abc123"',
+        "Last-Modified": "Mon, 01 Apr 2024 10:00:00 GMT",
+    }
+    return response
+
+
+def test_get_feed_entries_success(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+    mock_response: MagicMock,
+) -> None:
     """有効なフィードを正常にパースできることをテストします。
 
     Args:
         mocker: pytest-mockフィクスチャ。
         mock_feed_data: モックフィードデータを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
 
     """
+    mock_get = mocker.patch("util._SESSION.get", return_value=mock_response)
     mock_parse = mocker.patch("util.feedparser.parse", return_value=mock_feed_data)
     mocker.patch("util.logger")
 
     feed = get_feed_entries()
 
     assert feed == mock_feed_data
-    mock_parse.assert_called_once_with("https://aws.amazon.com/jp/blogs/news/tag/%E9%80%B1%E5%88%8Aaws/feed/")
+    mock_get.assert_called_once_with(
+        "https://aws.amazon.com/jp/blogs/news/tag/%E9%80%B1%E5%88%8Aaws/feed/",
+        headers={},
+        timeout=REQUEST_TIMEOUT,
+        stream=True,
+    )
+    mock_parse.assert_called_once_with(
+        b"<rss><channel></channel></rss>",
+        response_headers={
+            "content-type": "application/rss+xml; charset=UTF-8",
+            "etag": '"abc123"',
+            "last-modified": "Mon, 01 Apr 2024 10:00:00 GMT",
+            "content-location": RSS_FEED_URL,
+        },
+    )
+
 
+@pytest.mark.usefixtures("mock_datetime_now")
+def test_get_feed_entries_resolves_relative_links(
+    mocker: MockerFixture,
+    mock_response: MagicMock,
+) -> None:
+    """フィード内の相対 URL が、取得元の URL を基準に絶対 URL へ解決されることをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
+
+    """
+    mock_response.iter_content.return_value = [
+        "<rss version='2.0'><channel><title>t</title><item><title>週刊AWS - 2024/04/01</title>".encode(),
+        b"<link>/jp/blogs/news/weekly-aws-20240401/</link>",
+        b"<pubDate>Mon, 01 Apr 2024 10:00:00 +0000</pubDate></item></channel></rss>",
+    ]
+    mocker.patch("util._SESSION.get", return_value=mock_response)
+    mocker.patch("util.logger")
 
-def test_get_feed_entries_bozo(mocker: MockerFixture, mock_feed_data_bozo: FeedParserDict) -> None:
+    entries = get_recent_entries()
+
+    assert [entry.url for entry in entries] == ["https://aws.amazon.com/jp/blogs/news/weekly-aws-20240401/"]
+
+
+def test_get_feed_entries_bozo(
+    mocker: MockerFixture,
+    mock_feed_data_bozo: FeedParserDict,
+    mock_response: MagicMock,
+) -> None:
     """パースエラーのあるフィード(bozo=1)を適切に処理できることをテストします。
 
     Args:
         mocker: pytest-mockフィクスチャ。
         mock_feed_data_bozo: bozoフラグが設定されたモックフィードデータを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
 
     """
+    mocker.patch("util._SESSION.get", return_value=mock_response)
     mock_parse = mocker.patch("util.feedparser.parse", return_value=mock_feed_data_bozo)
     mock_logger_warning = mocker.patch("util.logger.warning")
 
     feed = get_feed_entries()
 
     assert feed == mock_feed_data_bozo
-    mock_parse.assert_called_once_with("https://aws.amazon.com/jp/blogs/news/tag/%E9%80%B1%E5%88%8Aaws/feed/")
+    mock_parse.assert_called_once()
     mock_logger_warning.assert_called_once_with(
         f"RSSパースエラー: {mock_feed_data_bozo.bozo_exception}",
     )
+    # エントリが空のフィードはキャッシュされない
+    assert RSS_FEED_URL not in _feed_cache
+
+
+def test_get_feed_entries_request_error(mocker: MockerFixture) -> None:
+    """フィードの取得に失敗した場合、空のフィードを返し警告を記録することをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+
+    """
+    error = requests.ConnectionError("Test connection error")
+    mocker.patch("util._SESSION.get", side_effect=error)
+    mock_parse = mocker.patch("util.feedparser.parse")
+    mock_logger_warning = mocker.patch("util.logger.warning")
+
+    feed = get_feed_entries()
+
+    assert feed.bozo
+    assert feed.entries == []
+    mock_parse.assert_not_called()
+    mock_logger_warning.assert_called_once_with(f"RSSパースエラー: {error}")
+    assert RSS_FEED_URL not in _feed_cache
+
+
+def test_get_feed_entries_uses_cache_within_ttl(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+    mock_response: MagicMock,
+) -> None:
+    """TTL 以内の再呼び出しではフィードを再取得しないことをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
+
+    """
+    mock_get = mocker.patch("util._SESSION.get", return_value=mock_response)
+    mocker.patch("util.feedparser.parse", return_value=mock_feed_data)
+    mocker.patch("util.time.monotonic", side_effect=[1000.0, 1000.0 + FEED_CACHE_TTL - 1])
+
+    first = get_feed_entries()
+    second = get_feed_entries()
+
+    assert first is second
+    mock_get.assert_called_once()
+
+
+def test_get_feed_entries_coalesces_concurrent_calls(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+    mock_response: MagicMock,
+) -> None:
+    """複数スレッドから同時に呼ばれても、フィードの取得が一度だけ行われることをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
+
+    """
+    threads = 4
+    barrier = threading.Barrier(threads)
+
+    def slow_get(*_args: object, **_kwargs: object) -> MagicMock:
+        time.sleep(0.05)  # 取得中に他のスレッドが到着するよう待機する
+        return mock_response
+
+    mock_get = mocker.patch("util._SESSION.get", side_effect=slow_get)
+    mocker.patch("util.feedparser.parse", return_value=mock_feed_data)
+
+    def call() -> FeedParserDict:
+        barrier.wait()
+        return get_feed_entries()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda _: call(), range(threads)))
+
+    assert all(result is mock_feed_data for result in results)
+    mock_get.assert_called_once()
+
+
+def test_get_feed_entries_not_modified(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+    mock_response: MagicMock,
+) -> None:
+    """TTL 切れ後に 304 が返った場合、ETag を送信し前回のパース結果を再利用することをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
+
+    """
+    not_modified = MagicMock()
+    not_modified.__enter__.return_value = not_modified
+    not_modified.status_code = HTTPStatus.NOT_MODIFIED
+    mock_get = mocker.patch("util._SESSION.get", side_effect=[mock_response, not_modified])
+    mock_parse = mocker.patch("util.feedparser.parse", return_value=mock_feed_data)
+    mocker.patch("util.time.monotonic", side_effect=[1000.0, 1000.0 + FEED_CACHE_TTL + 1])
+
+    first = get_feed_entries()
+    second = get_feed_entries()
+
+    assert second is first
+    mock_parse.assert_called_once()
+    mock_get.assert_called_with(
+        RSS_FEED_URL,
+        headers={"If-None-Match": '"abc123"', "If-Modified-Since": "Mon, 01 Apr 2024 10:00:00 GMT"},
+        timeout=REQUEST_TIMEOUT,
+        stream=True,
+    )
+
+
+def test_get_feed_entries_same_body_skips_parse(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+    mock_response: MagicMock,
+) -> None:
+    """TTL 切れ後に同一内容の本文が返った場合、再パースせずに前回の結果を使うことをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
+
+    """
+    mock_get = mocker.patch("util._SESSION.get", return_value=mock_response)
+    mock_parse = mocker.patch("util.feedparser.parse", return_value=mock_feed_data)
+    mocker.patch("util.time.monotonic", side_effect=[1000.0, 1000.0 + FEED_CACHE_TTL + 1])
+
+    first = get_feed_entries()
+    second = get_feed_entries()
+
+    assert second is first
+    assert mock_get.call_count == 2  # noqa: PLR2004
+    mock_parse.assert_called_once()
+
+
+def test_get_feed_entries_changed_body_reparses(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+    mock_feed_entry_base: dict,
+    mock_response: MagicMock,
+) -> None:
+    """TTL 切れ後に内容が変わった本文が返った場合、再パースすることをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+        mock_feed_entry_base: 基本的なフィードエントリを提供するフィクスチャ。
+        mock_response: モック HTTP レスポンスを提供するフィクスチャ。
+
+    """
+    updated_response = MagicMock()
+    updated_response.__enter__.return_value = updated_response
+    updated_response.status_code = HTTPStatus.OK
+    updated_response.iter_content.return_value = [b"<rss><channel><item>new</item></channel></rss>"]
+    updated_response.headers = {}
+    updated_feed = FeedParserDict()
+    updated_feed.entries = [FeedParserDict(mock_feed_entry_base)]
+    mocker.patch("util._SESSION.get", side_effect=[mock_response, updated_response])
+    mock_parse = mocker.patch("util.feedparser.parse", side_effect=[mock_feed_data, updated_feed])
+    mocker.patch("util.time.monotonic", side_effect=[1000.0, 1000.0 + FEED_CACHE_TTL + 1])
+
+    get_feed_entries()
+    second = get_feed_entries()
+
+    assert second is updated_feed
+    assert mock_parse.call_count == 2  # noqa: PLR2004
+
+
+# --- Tests for warm_up_feedparser ---
+
+
+def test_warm_up_feedparser(mocker: MockerFixture) -> None:
+    """ネットワークにアクセスせず、組み込みの最小フィードをパースすることをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+
+    """
+    mock_get = mocker.patch("util._SESSION.get")
+    spy_parse = mocker.spy(feedparser, "parse")
+
+    warm_up_feedparser()
+
+    mock_get.assert_not_called()
+    spy_parse.assert_called_once()
+    assert not spy_parse.spy_return.bozo
+    assert len(spy_parse.spy_return.entries) == 1
+
+
+# --- Tests for _read_feed_body ---
+
+
+def test_read_feed_body_stops_after_max_entries() -> None:
+    """上限を超える <item> を受信した時点で読み込みを打ち切ることをテストします。"""
+    response = MagicMock()
+    # 閉じタグがチャンク境界をまたぐケースを含む
+    chunks = [b"<rss><channel><item>1</it", b"em><item>2</item>", b"<item>3</item>", b"<item>4</item>"]
+    response.iter_content.return_value = iter(chunks)
+
+    body = _read_feed_body(response, max_entries=2)
+
+    assert body == b"".join(chunks[:3])
+    # 打ち切り後のチャンクは読み込まれない
+    assert next(response.iter_content.return_value) == chunks[3]
+
+
+def test_read_feed_body_ignores_item_end_tag_in_cdata() -> None:
+    """CDATA 内の </item> をエントリの終わりとして数えないことをテストします。"""
+    response = MagicMock()
+    # CDATA がチャンク境界をまたぐケースを含む
+    chunks = [b"<rss><channel><item><![CDATA[a</item>", b"b]]></item>", b"<item>2</item>", b"<item>3</item>"]
+    response.iter_content.return_value = iter(chunks)
+
+    body = _read_feed_body(response, max_entries=1)
+
+    assert body == b"".join(chunks[:3])
+
+
+def test_read_feed_body_reads_whole_small_feed() -> None:
+    """エントリ数が上限以下のフィードは最後まで読み込むことをテストします。"""
+    response = MagicMock()
+    chunks = [b"<rss><channel><item>1</item>", b"</channel></rss>"]
+    response.iter_content.return_value = chunks
+
+    assert _read_feed_body(response, max_entries=2) == b"".join(chunks)
+
+
+# --- Tests for _truncate_feed ---
+
+
+def test_truncate_feed_cuts_after_max_entries() -> None:
+    """上限を超えるエントリが切り捨てられ、閉じタグが補われることをテストします。"""
+    body = b"<rss><channel><item>1</item><item>2</item><item>3</item></channel></rss>"
+
+    assert _truncate_feed(body, max_entries=2) == b"<rss><channel><item>1</item><item>2</item></channel></rss>"
+
+
+def test_truncate_feed_ignores_item_end_tag_in_cdata() -> None:
+    """CDATA 内の </item> では切り詰めず、切り詰め後もエントリを正しくパースできることをテストします。"""
+    cdata_item = (
+        b"<item><title>1</title><link>https://example.com/1</link>"
+        b"<content:encoded><![CDATA[<p>a</item>b</p>]]></content:encoded></item>"
+    )
+    body = (
+        b"<?xml version='1.0'?>"
+        b"<rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'><channel><title>t</title>"
+        + cdata_item
+        + b"<item><title>2</title></item><item><title>3</title></item></channel></rss>"
+    )
+
+    truncated = _truncate_feed(body, max_entries=1)
+    feed = feedparser.parse(truncated)
+
+    assert truncated.endswith(cdata_item + b"</channel></rss>")
+    assert not feed.bozo
+    assert [entry.title for entry in feed.entries] == ["1"]
+    assert feed.entries[0].content[0].value == "<p>ab</p>"
+
+
+def test_truncate_feed_within_limit() -> None:
+    """エントリ数が上限以下の場合、本文がそのまま返されることをテストします。"""
+    body = b"<rss><channel><item>1</item><item>2</item></channel></rss>"
+
+    assert _truncate_feed(body, max_entries=2) is body
+    assert _truncate_feed(body, max_entries=3) is body
+
+
+# --- Tests for _validate_url ---
+
+
+def test_validate_url_returns_normalized_string() -> None:
+    """有効な URL が正規化された文字列として返されることをテストします。"""
+    assert _validate_url("https://example.com") == "https://example.com/"
+    assert _validate_url("http://example.com/weekly1") == "http://example.com/weekly1"
+
+
+def test_validate_url_invalid() -> None:
+    """無効な URL で ValidationError が送出されることをテストします。"""
+    with pytest.raises(ValidationError):
+        _validate_url("not a url")
 
 
 # --- Tests for _extract_content_string ---
@@ -224,7 +644,7 @@ def test_extract_content_string(
 
 @pytest.fixture
 def mock_datetime_now(mocker: MockerFixture) -> datetime:
-    """datetime.now をモックして固定の UTC 時刻を返すフィクスチャ。
+    """datetime.now と time.time をモックして固定の UTC 時刻を返すフィクスチャ。
 
     Args:
         mocker: pytest-mockフィクスチャ。
@@ -248,6 +668,8 @@ def mock_datetime_now(mocker: MockerFixture) -> datetime:
     mock_dt.now.return_value = fixed_now
     # コンストラクタ呼び出し(モック自体が呼び出された場合)の side_effect を設定
     mock_dt.side_effect = datetime_side_effect
+    # 期間判定に使う現在の UNIX 時刻も固定する
+    mocker.patch("util.time.time", return_value=fixed_now.timestamp())
 
     return fixed_now  # テスト用に固定時刻を返す
 
@@ -333,6 +755,101 @@ def test_get_recent_entries_custom_limit(
     assert entries[0].title == "週刊AWS - 2024/04/01"
 
 
+@pytest.mark.usefixtures("mock_datetime_now")
+def test_get_recent_entries_limit_capped_at_max_entries(
+    mocker: MockerFixture,
+    mock_feed_entry_base: dict,
+) -> None:
+    """`MAX_ENTRIES` を超える limit が `MAX_ENTRIES` 件に制限されることをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_entry_base: 基本的なフィードエントリを提供するフィクスチャ。
+
+    """
+    feed = FeedParserDict()
+    feed.entries = [FeedParserDict(mock_feed_entry_base) for _ in range(MAX_ENTRIES + 5)]
+    mocker.patch("util.get_feed_entries", return_value=feed)
+    mock_logger = mocker.patch("util.logger")
+
+    entries = get_recent_entries(limit=MAX_ENTRIES + 20)
+
+    assert len(entries) == MAX_ENTRIES
+    mock_logger.info.assert_called_once()
+
+
+@pytest.mark.usefixtures("mock_datetime_now")
+def test_get_recent_entries_unsorted_feed(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+) -> None:
+    """古い順に並んだフィードでも、期間内のエントリを取りこぼさないことをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    unsorted_feed = FeedParserDict()
+    unsorted_feed.bozo = 0
+    unsorted_feed.entries = list(reversed(mock_feed_data.entries))  # 古い順
+    mocker.patch("util.get_feed_entries", return_value=unsorted_feed)
+
+    entries = get_recent_entries()
+
+    assert [e.title for e in entries] == ["週刊生成AI with AWS - 2024/03/25", "週刊AWS - 2024/04/01"]
+
+
+@pytest.mark.usefixtures("mock_datetime_now")
+def test_get_recent_entries_skips_entries_without_published(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+) -> None:
+    """公開日時を持たないエントリを除外して記事リストを返すことをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    undated = FeedParserDict({"title": "週刊AWS - 日付なし", "link": "http://example.com/undated"})
+    feed = FeedParserDict()
+    feed.bozo = 0
+    feed.entries = [undated, *mock_feed_data.entries]
+    mocker.patch("util.get_feed_entries", return_value=feed)
+    mock_logger_warning = mocker.patch("util.logger.warning")
+
+    entries = get_recent_entries()
+
+    assert [e.title for e in entries] == ["週刊AWS - 2024/04/01", "週刊生成AI with AWS - 2024/03/25"]
+    mock_logger_warning.assert_called_once_with("公開日時を取得できないエントリをスキップします: 週刊AWS - 日付なし")
+
+
+@pytest.mark.usefixtures("mock_datetime_now")
+def test_get_recent_entries_stops_before_trailing_entries(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+) -> None:
+    """期間外のエントリで走査を打ち切り、それ以降のエントリを判定しないことをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    undated = FeedParserDict({"title": "週刊AWS - 日付なし", "link": "http://example.com/undated"})
+    feed = FeedParserDict()
+    feed.bozo = 0
+    feed.entries = [*mock_feed_data.entries, undated]
+    mocker.patch("util.get_feed_entries", return_value=feed)
+    mock_logger_warning = mocker.patch("util.logger.warning")
+
+    entries = get_recent_entries()
+
+    assert [e.title for e in entries] == ["週刊AWS - 2024/04/01", "週刊生成AI with AWS - 2024/03/25"]
+    mock_logger_warning.assert_not_called()
+
+
 def test_get_recent_entries_empty_feed(
     mocker: MockerFixture,
     mock_feed_data_empty: FeedParserDict,
@@ -373,6 +890,47 @@ def test_get_recent_entries_no_recent_entries(
     assert len(entries) == 0
 
 
+# --- Tests for _scan_latest ---
+
+
+def test_scan_latest_classifies_in_single_pass(mock_feed_data: FeedParserDict) -> None:
+    """_scan_latest が並び順に関係なく、カテゴリごとの最新エントリを返すことをテストします。
+
+    Args:
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    weekly1, gen_ai1, weekly2 = mock_feed_data.entries
+
+    latest_weekly_aws, latest_gen_ai = _scan_latest([weekly2, gen_ai1, weekly1])
+
+    assert latest_weekly_aws is weekly1
+    assert latest_gen_ai is gen_ai1
+
+
+def test_scan_latest_skips_entries_without_published(mock_feed_data: FeedParserDict) -> None:
+    """公開日時を持たないエントリが例外にならず、スキップされることをテストします。
+
+    Args:
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    weekly1, gen_ai1, weekly2 = mock_feed_data.entries
+    undated = FeedParserDict({"title": "週刊AWS - 日付なし", "link": "http://example.com/undated"})
+
+    latest_weekly_aws, latest_gen_ai = _scan_latest([undated, weekly1, gen_ai1, weekly2])
+
+    assert latest_weekly_aws is weekly1
+    assert latest_gen_ai is gen_ai1
+
+
+def test_scan_latest_no_match() -> None:
+    """該当するエントリがない場合に (None, None) を返すことをテストします。"""
+    other = FeedParserDict({"title": "AWS ブログ", "published_parsed": (2024, 4, 1, 10, 0, 0, 0, 92, 0)})
+
+    assert _scan_latest([other]) == (None, None)
+
+
 # --- Tests for get_latest_weekly_aws_details ---
 
 
@@ -497,8 +1055,8 @@ def test_get_latest_weekly_aws_details_exception(
 
     """
     mock_get_feed = mocker.patch("util.get_feed_entries", return_value=mock_feed_data)
-    # max() 呼び出し中または属性アクセス中にエラーをシミュレート
-    mocker.patch("builtins.max", side_effect=ValueError("Test Exception"))
+    # 公開日時の変換中にエラーをシミュレート
+    mocker.patch("util.calendar.timegm", side_effect=ValueError("Test Exception"))
     mock_logger_error = mocker.patch("util.logger.error")
 
     details = get_latest_weekly_aws_details()
@@ -513,6 +1071,52 @@ def test_get_latest_weekly_aws_details_exception(
     assert kwargs.get("exc_info") is True
 
 
+def test_get_latest_weekly_aws_details_reuses_result_for_same_feed(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+) -> None:
+    """同一のフィードに対する再呼び出しでは、前回の結果を再利用することをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    mocker.patch("util.get_feed_entries", return_value=mock_feed_data)
+    mock_extract = mocker.patch("util._extract_content_string", return_value="Extracted Weekly Content")
+
+    first = get_latest_weekly_aws_details()
+    second = get_latest_weekly_aws_details()
+
+    assert second is first
+    mock_extract.assert_called_once()
+
+
+def test_get_latest_weekly_aws_details_recomputes_for_new_feed(
+    mocker: MockerFixture,
+    mock_feed_data: FeedParserDict,
+) -> None:
+    """フィードが更新された (別のオブジェクトになった) 場合は、結果を再計算することをテストします。
+
+    Args:
+        mocker: pytest-mockフィクスチャ。
+        mock_feed_data: モックフィードデータを提供するフィクスチャ。
+
+    """
+    updated_feed = FeedParserDict()
+    updated_feed.bozo = 0
+    updated_feed.entries = mock_feed_data.entries[2:]
+    mocker.patch("util.get_feed_entries", side_effect=[mock_feed_data, updated_feed])
+
+    first = get_latest_weekly_aws_details()
+    second = get_latest_weekly_aws_details()
+
+    assert first is not None
+    assert second is not None
+    assert first.title == "週刊AWS - 2024/04/01"
+    assert second.title == "週刊AWS - 2024/03/18"
+
+
 # --- Tests for get_latest_generative_ai_details ---
 
 
@@ -629,7 +1233,7 @@ def test_get_latest_generative_ai_details_exception(
 
     """
     mock_get_feed = mocker.patch("util.get_feed_entries", return_value=mock_feed_data)
-    mocker.patch("builtins.max", side_effect=TypeError("Another Test Exception"))  # Simulate different error
+    mocker.patch("util.calendar.timegm", side_effect=TypeError("Another Test Exception"))  # Simulate different error
     mock_logger_error = mocker.patch("util.logger.error")
 
     details = get_latest_generative_ai_details()
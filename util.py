@@ -1,136 +1,381 @@
-from datetime import UTC, datetime, timedelta
+import calendar
+import hashlib
+import threading
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from http import HTTPStatus
+from itertools import chain, islice, takewhile
 
 import feedparser
+import requests
 from feedparser import FeedParserDict
 from loguru import logger
+from pydantic import AnyUrl, TypeAdapter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from models import WeeklyAWSJpDetailedUpdate, WeeklyAWSJpUpdate
 
 # --- Constants ---
 RSS_FEED_URL = "https://aws.amazon.com/jp/blogs/news/tag/%E9%80%B1%E5%88%8Aaws/feed/"
 REQUEST_TIMEOUT = 10
+FEED_CACHE_TTL = 300  # フィードを再取得せずに使い回す秒数
+# パース対象とするフィードエントリの最大数。`get_recent_entries` が返す件数の上限も兼ねるため、
+# 変更する場合は server.py の `get_weekly_jp_updates` の docstring と README.md の上限値も合わせて更新する
+MAX_ENTRIES = 30
+FEED_CHUNK_SIZE = 64 * 1024  # フィード本文をストリームで読み込む際のチャンクサイズ (バイト)
+WEEKLY_AWS_KEYWORD = "週刊AWS"  # 「週刊AWS」記事のタイトルに含まれる文字列
+GEN_AI_KEYWORD = "週刊生成AI"  # 「週刊生成AI with AWS」記事のタイトルに含まれる文字列
+_SECONDS_PER_DAY = 24 * 60 * 60
+_STRUCT_TIME_LENGTH = 9
+_ORDER_CHECK_ENTRIES = 2  # フィードが新しい順に並んでいるかの判定に使う先頭エントリ数
+# `_scan_latest` が返すタプルにおける各カテゴリの位置
+_WEEKLY_AWS = 0
+_GEN_AI = 1
+_ITEM_END_TAG = b"</item>"
+_FEED_CLOSING_TAGS = b"</channel></rss>"
+_CDATA_START = b"<![CDATA["
+_CDATA_END = b"]]>"
+_WARMUP_FEED = b"<rss version='2.0'><channel><item><title>warmup</title></item></channel></rss>"
+
+# --- HTTP ---
+# 接続 (TCP / TLS) を呼び出し間で再利用するため、セッションを一つだけ生成して使い回す
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "weekly-aws-jp-mcp-server/0.1.0"})
+# 取得先は aws.amazon.com のみで、取得処理も `_feed_lock` で直列化されるため小さなプールで十分
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
+
+# --- Cache ---
+# フィード URL ごとに、取得時刻 / ETag / Last-Modified / 本文のハッシュ / パース結果を保持する
+_feed_cache: dict[str, dict] = {}
+# 複数のツール呼び出しが同時にフィードを取得しないよう、取得処理を直列化する
+_feed_lock = threading.Lock()
+# カテゴリごとに、最新記事の詳細とその算出元のフィードを保持する
+_latest_details_cache: dict[int, tuple[FeedParserDict, WeeklyAWSJpDetailedUpdate | None]] = {}
+
+# --- Validators ---
+# TypeAdapter はスキーマ構築コストが高いため、モジュール読み込み時に一度だけ生成して使い回す
+_UPDATE_LIST_ADAPTER = TypeAdapter(list[WeeklyAWSJpUpdate])
+_DETAILED_UPDATE_ADAPTER = TypeAdapter(WeeklyAWSJpDetailedUpdate)
+
+
+def warm_up_feedparser() -> None:
+    """初回パース時に行われる feedparser の遅延初期化を事前に済ませる
+
+    サーバー起動時に呼び出すことで、最初のツール呼び出しの待ち時間を短縮します。
+    """
+    feedparser.parse(_WARMUP_FEED)
+
+
+def _find_item_end(body: bytes, start: int = 0) -> int:
+    """`start` 以降で最初に現れる </item> の直後の位置を返す (見つからない場合は -1)
+
+    content:encoded などの CDATA 内に書かれた </item> は要素の終わりではないため、CDATA 区間は読み飛ばします。
+    """
+    pos = start
+    while True:
+        end = body.find(_ITEM_END_TAG, pos)
+        if end == -1:
+            return -1
+        cdata_start = body.find(_CDATA_START, pos, end)
+        if cdata_start == -1:
+            return end + len(_ITEM_END_TAG)
+        cdata_end = body.find(_CDATA_END, cdata_start + len(_CDATA_START))
+        if cdata_end == -1:
+            # CDATA がまだ閉じていない (本文の受信途中を含む)
+            return -1
+        pos = cdata_end + len(_CDATA_END)
+
+
+def _truncate_feed(body: bytes, max_entries: int = MAX_ENTRIES) -> bytes:
+    """RSS 本文を先頭 `max_entries` 件の <item> までに切り詰める
+
+    feedparser は全エントリの HTML をサニタイズするため、パース対象のエントリ数を制限します。
+    エントリ数が上限以下の場合は本文をそのまま返します。
+    """
+    end = 0
+    for _ in range(max_entries):
+        end = _find_item_end(body, end)
+        if end == -1:
+            return body
+    if _find_item_end(body, end) == -1:
+        return body
+    return body[:end] + _FEED_CLOSING_TAGS
+
+
+def _read_feed_body(response: requests.Response, max_entries: int = MAX_ENTRIES) -> bytes:
+    """レスポンス本文をストリームで読み込む
+
+    `max_entries` 件を超える <item> を受信した時点で読み込みを打ち切り、残りはダウンロードしません。
+    """
+    body = bytearray()
+    item_count = 0
+    # 最後に数えた </item> の直後の位置。チャンク境界をまたぐ閉じタグや CDATA もここから探し直す
+    scanned = 0
+    for chunk in response.iter_content(chunk_size=FEED_CHUNK_SIZE):
+        body += chunk
+        while (end := _find_item_end(body, scanned)) != -1:
+            item_count += 1
+            scanned = end
+        if item_count > max_entries:
+            break
+    return bytes(body)
 
 
 def get_feed_entries() -> FeedParserDict:
-    """RSSフィードを取得してパースする"""
-    feed = feedparser.parse(RSS_FEED_URL)
+    """RSSフィードを取得してパースする
+
+    前回の取得から `FEED_CACHE_TTL` 秒以内であればキャッシュを返します。
+    期限切れの場合は ETag / Last-Modified を付けた条件付き GET を行い、
+    304 Not Modified が返れば前回のパース結果を再利用します。
+    複数スレッドから同時に呼ばれた場合も取得は一度だけ行われ、後続の呼び出しはその結果を使います。
+    """
+    with _feed_lock:
+        return _load_feed()
+
+
+def _load_feed() -> FeedParserDict:
+    """キャッシュ、または RSS フィードの取得結果を返す (`_feed_lock` を保持した状態で呼び出す)"""
+    now = time.monotonic()
+    cached = _feed_cache.get(RSS_FEED_URL)
+    if cached and now - cached["fetched_at"] < FEED_CACHE_TTL:
+        return cached["feed"]
+
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["modified"]:
+        headers["If-Modified-Since"] = cached["modified"]
+
+    try:
+        with _SESSION.get(RSS_FEED_URL, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+                logger.debug("RSSフィードは更新されていません。キャッシュを使用します。")
+                cached["fetched_at"] = now
+                return cached["feed"]
+            response.raise_for_status()
+            body = _read_feed_body(response)
+    except requests.RequestException as e:
+        feed = FeedParserDict(bozo=True, bozo_exception=e, entries=[])
+    else:
+        body = _truncate_feed(body)
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if cached and cached["body_hash"] == body_hash:
+            # ETag / Last-Modified が正しく返されない場合でも、内容が同一であれば再パースしない
+            logger.debug("RSSフィードの内容に変更がないため、前回のパース結果を使用します。")
+            cached["fetched_at"] = now
+            cached["etag"] = response.headers.get("ETag")
+            cached["modified"] = response.headers.get("Last-Modified")
+            return cached["feed"]
+        # feedparser はヘッダー名を小文字で参照するため、小文字のキーに変換して渡す
+        response_headers = {key.lower(): value for key, value in response.headers.items()}
+        # 本文のみを渡すと相対 URL の基準が失われるため、取得元の URL を基準として伝える
+        response_headers.setdefault("content-location", response.url)
+        feed = feedparser.parse(body, response_headers=response_headers)
+
     if getattr(feed, "bozo", False):
         logger.warning(f"RSSパースエラー: {feed.bozo_exception}")
+
+    # 取得に失敗した (エントリが空の) フィードはキャッシュしない
+    if feed.entries:
+        _feed_cache[RSS_FEED_URL] = {
+            "fetched_at": now,
+            "etag": response.headers.get("ETag"),
+            "modified": response.headers.get("Last-Modified"),
+            "body_hash": body_hash,
+            "feed": feed,
+        }
     return feed
 
 
+def _validate_url(raw_url: str) -> str:
+    """フィード由来の URL を検証し、正規化した文字列として返す"""
+    return str(AnyUrl(raw_url))
+
+
+def _content_from_list(content_data: list) -> str | None:
+    """Feedparser の content リストの先頭要素から文字列を抽出する"""
+    # .value 属性があればそれを使う (なければ None)
+    content_value = getattr(content_data[0], "value", None)
+    if isinstance(content_value, str):
+        return content_value
+    # .value が文字列でない場合も None とする
+    logger.warning(f"content[0].value が文字列ではありません: {type(content_value)}")
+    return None
+
+
+def _content_from_str(content_data: str) -> str:
+    return content_data
+
+
+def _content_from_unexpected(content_data: object) -> None:
+    # 予期しない型の場合は None を返す
+    logger.warning(f"予期しない content の型: {type(content_data)}")
+
+
+# feedparser は content を list か str で返すため、サブクラスを考慮しない type() で振り分ける
+_CONTENT_EXTRACTORS = {
+    list: _content_from_list,
+    str: _content_from_str,
+}
+
+
 def _extract_content_string(content_data: str) -> str | None:
     """Feedparser の content データから文字列を抽出する"""
+    # None・空文字列・空リストはここで除外する
     if not content_data:
         return None
-    if isinstance(content_data, list):
-        if not content_data:
-            return None
-        # 最初の要素を取得
-        first_content = content_data[0]
-        # .value 属性があればそれを使う (なければ None)
-        content_value = getattr(first_content, "value", None)
-        if isinstance(content_value, str):
-            return content_value
-        # .value が文字列でない場合も None とする
-        logger.warning(f"content[0].value が文字列ではありません: {type(content_value)}")
-        return None
-    if isinstance(content_data, str):
-        return content_data
-    # 予期しない型の場合は None を返す
-    logger.warning(f"予期しない content の型: {type(content_data)}")
-    return None
+    return _CONTENT_EXTRACTORS.get(type(content_data), _content_from_unexpected)(content_data)
 
 
-def get_recent_entries(days: int = 7, limit: int = 20) -> list[WeeklyAWSJpUpdate]:
-    """指定日数分の記事エントリを取得する"""
-    feed = get_feed_entries()
-    cutoff = datetime.now(UTC) - timedelta(days=days)
-
-    entries = []
-    for entry in feed.entries:
-        pub_date = datetime(*entry.published_parsed[:6], tzinfo=UTC)
-        if pub_date >= cutoff:
-            entries.append(
-                WeeklyAWSJpUpdate(
-                    title=entry.title,
-                    url=entry.link,
-                    published=pub_date,
-                    summary=getattr(entry, "summary", None),
-                ),
-            )
-        if len(entries) >= limit:
-            break
+def _entry_timestamp(entry: FeedParserDict) -> int:
+    """エントリの公開日時を UNIX 時刻 (秒) で返す"""
+    return calendar.timegm(entry.published_parsed)
 
-    return entries
 
+def _dated_entries(entries: list[FeedParserDict]) -> Iterator[FeedParserDict]:
+    """公開日時 (`published_parsed`) を正しく持つエントリのみを順に返す
 
-def get_latest_weekly_aws_details() -> WeeklyAWSJpDetailedUpdate | None:
-    """最新の「週刊AWS」記事の詳細を1件取得する
+    走査の打ち切り後に残るエントリは判定しないよう、ジェネレーターとして逐次処理します。
+    """
+    for entry in entries:
+        published_parsed = getattr(entry, "published_parsed", None)
+        if published_parsed is None or len(published_parsed) != _STRUCT_TIME_LENGTH:
+            logger.warning(f"公開日時を取得できないエントリをスキップします: {getattr(entry, 'title', '')}")
+            continue
+        yield entry
 
-    Returns:
-        WeeklyAWSJpDetailedUpdate | None: 最新の「週刊AWS」記事の詳細
 
+def _build_detailed_update(entry: FeedParserDict) -> WeeklyAWSJpDetailedUpdate:
+    """フィードエントリから WeeklyAWSJpDetailedUpdate を生成する"""
+    content_data = getattr(entry, "content", None)
+    return _DETAILED_UPDATE_ADAPTER.validate_python(
+        {
+            "title": entry.title,
+            "url": _validate_url(entry.link),
+            "published": datetime(*entry.published_parsed[:6], tzinfo=UTC),
+            "summary": getattr(entry, "summary", None),
+            "content": _extract_content_string(content_data),
+        },
+    )
+
+
+def get_recent_entries(days: int = 7, limit: int = 20) -> list[WeeklyAWSJpUpdate]:
+    """指定日数分の記事エントリを取得する
+
+    フィードは新しい順に並んでいるため、`days` より古いエントリが現れた時点、
+    または `limit` 件に達した時点で走査を打ち切ります。
+    先頭 2 件が古い順に並んでいる場合は、打ち切らずに全エントリを判定します。
+    フィードは先頭 `MAX_ENTRIES` 件までしか読み込まないため、返される件数も `MAX_ENTRIES` 件が上限です。
     """
+    if limit > MAX_ENTRIES:
+        logger.info(f"取得件数の上限は {MAX_ENTRIES} 件のため、limit={limit} を {MAX_ENTRIES} に制限します。")
+        limit = MAX_ENTRIES
     feed = get_feed_entries()
-    if not feed.entries:
-        return None
+    # 期間判定は UNIX 時刻で行い、datetime は条件を満たしたエントリに対してのみ生成する
+    cutoff_ts = time.time() - days * _SECONDS_PER_DAY
+
+    def is_recent(entry: FeedParserDict) -> bool:
+        return _entry_timestamp(entry) >= cutoff_ts
 
-    # タイトルに「週刊AWS」を含み、「週刊生成AI with AWS」を含まないエントリをフィルタリング
-    weekly_aws_entries = [
-        e for e in feed.entries if "週刊AWS" in getattr(e, "title", "") and "週刊生成AI" not in getattr(e, "title", "")
+    dated_entries = _dated_entries(feed.entries)
+    # 並び順の判定に使う先頭のエントリだけを先に取り出し、残りは走査時に逐次判定する
+    head = list(islice(dated_entries, _ORDER_CHECK_ENTRIES))
+    entries = chain(head, dated_entries)
+    if len(head) == _ORDER_CHECK_ENTRIES and _entry_timestamp(head[0]) < _entry_timestamp(head[1]):
+        # 新しい順に並んでいないフィードでは打ち切らずに全件を判定する
+        logger.debug("RSSフィードが新しい順に並んでいないため、全エントリを走査します。")
+        recent_entries = filter(is_recent, entries)
+    else:
+        recent_entries = takewhile(is_recent, entries)
+
+    raw_entries = [
+        {
+            "title": entry.title,
+            "url": _validate_url(entry.link),
+            "published": datetime(*entry.published_parsed[:6], tzinfo=UTC),
+            "summary": getattr(entry, "summary", None),
+        }
+        for entry in islice(recent_entries, max(limit, 0))
     ]
-    if not weekly_aws_entries:
-        logger.info("最新の「週刊AWS」記事が見つかりませんでした。")
-        return None
 
-    try:
-        latest = max(weekly_aws_entries, key=lambda e: datetime(*e.published_parsed[:6], tzinfo=UTC))
+    # 要素ごとにモデルを生成せず、リスト全体を一度にバリデーションする
+    return _UPDATE_LIST_ADAPTER.validate_python(raw_entries)
 
-        content_data = getattr(latest, "content", None)
-        content_str = _extract_content_string(content_data)
 
-        return WeeklyAWSJpDetailedUpdate(
-            title=latest.title,
-            url=latest.link,
-            published=datetime(*latest.published_parsed[:6], tzinfo=UTC),
-            summary=getattr(latest, "summary", None),
-            content=content_str,
-        )
+def _scan_latest(entries: list[FeedParserDict]) -> tuple[FeedParserDict | None, FeedParserDict | None]:
+    """フィードを一度だけ走査し、最新の「週刊AWS」と「週刊生成AI with AWS」のエントリを返す
 
-    except Exception as e:
-        logger.error(f"最新の「週刊AWS」記事詳細の処理中にエラー: {e}", exc_info=True)
-        return None
+    公開日時の比較には `datetime` を生成せず、整数の UNIX 時刻を用います。
 
+    Returns:
+        tuple: (最新の「週刊AWS」エントリ, 最新の「週刊生成AI with AWS」エントリ)。見つからない場合は None
 
-def get_latest_generative_ai_details() -> WeeklyAWSJpDetailedUpdate | None:
-    """最新の「週刊生成AI with AWS」記事の詳細を1件取得する"""
+    """
+    latest_weekly_aws = latest_gen_ai = None
+    weekly_aws_ts = gen_ai_ts = 0
+    for entry in _dated_entries(entries):
+        title = getattr(entry, "title", "")
+        # 「週刊生成AI with AWS」は「週刊AWS」から除外する
+        if GEN_AI_KEYWORD in title:
+            pub_ts = _entry_timestamp(entry)
+            if latest_gen_ai is None or pub_ts > gen_ai_ts:
+                latest_gen_ai, gen_ai_ts = entry, pub_ts
+        elif WEEKLY_AWS_KEYWORD in title:
+            pub_ts = _entry_timestamp(entry)
+            if latest_weekly_aws is None or pub_ts > weekly_aws_ts:
+                latest_weekly_aws, weekly_aws_ts = entry, pub_ts
+    return latest_weekly_aws, latest_gen_ai
+
+
+def _get_latest_details(category: int, label: str) -> WeeklyAWSJpDetailedUpdate | None:
+    """指定カテゴリの最新記事の詳細を1件取得する
+
+    フィードが前回の呼び出しと同一であれば、前回の結果をそのまま返します。
+
+    Args:
+        category: `_scan_latest` の戻り値におけるカテゴリの位置 (`_WEEKLY_AWS` / `_GEN_AI`)
+        label: ログに使用するカテゴリ名
+
+    """
     feed = get_feed_entries()
     if not feed.entries:
         return None
 
-    # タイトルに「週刊生成AI with AWS」を含むエントリをフィルタリング
-    gen_ai_entries = [e for e in feed.entries if "週刊生成AI" in getattr(e, "title", "")]
-    if not gen_ai_entries:
-        logger.info("最新の「週刊生成AI with AWS」記事が見つかりませんでした。")
-        return None
+    memo = _latest_details_cache.get(category)
+    if memo and memo[0] is feed:
+        return memo[1]
 
     try:
-        latest = max(gen_ai_entries, key=lambda e: datetime(*e.published_parsed[:6], tzinfo=UTC))
-        pub_date = datetime(*latest.published_parsed[:6], tzinfo=UTC)
-
-        content_data = getattr(latest, "content", None)
-        content_str = _extract_content_string(content_data)
-
-        # 詳細モデルを作成して返す
-        return WeeklyAWSJpDetailedUpdate(
-            title=latest.title,
-            url=latest.link,
-            published=pub_date,
-            summary=getattr(latest, "summary", None),
-            content=content_str,  # Use the extracted string or None
-        )
-
-    except Exception as e:
-        logger.error(f"最新の「週刊生成AI with AWS」記事詳細の処理中にエラー: {e}", exc_info=True)
+        latest = _scan_latest(feed.entries)[category]
+        if latest is None:
+            logger.info(f"最新の「{label}」記事が見つかりませんでした。")
+            details = None
+        else:
+            details = _build_detailed_update(latest)
+
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.error(f"最新の「{label}」記事詳細の処理中にエラー: {e}", exc_info=True)
         return None
+
+    _latest_details_cache[category] = (feed, details)
+    return details
+
+
+def get_latest_weekly_aws_details() -> WeeklyAWSJpDetailedUpdate | None:
+    """最新の「週刊AWS」記事の詳細を1件取得する
+
+    Returns:
+        WeeklyAWSJpDetailedUpdate | None: 最新の「週刊AWS」記事の詳細
+
+    """
+    return _get_latest_details(_WEEKLY_AWS, "週刊AWS")
+
+
+def get_latest_generative_ai_details() -> WeeklyAWSJpDetailedUpdate | None:
+    """最新の「週刊生成AI with AWS」記事の詳細を1件取得する"""
+    return _get_latest_details(_GEN_AI, "週刊生成AI with AWS")